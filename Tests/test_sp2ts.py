@@ -10,10 +10,14 @@ Jamie Taylor 2020-03-31
 """
 
 import unittest
+import importlib
 from datetime import datetime, date
 import pytz
+import numpy as np
 
-from sp2ts import to_unixtime, from_unixtime, sp2ts, ts2sp
+from sp2ts import to_unixtime, from_unixtime, sp2ts, ts2sp, sp2ts_batch, ts2sp_batch
+
+sp2ts_module = importlib.import_module("sp2ts.sp2ts")
 
 TEST_VALUES = [ # Should probably load these from file or at least a separate module for neatness
     # --- Test SP 24 around clock change ---
@@ -161,6 +165,8 @@ class sp2tsTestCase(unittest.TestCase):
         # Test with separate tz_info
         self.assertEqual(to_unixtime(dt_no_dst_naive, "Europe/London"), 1585398896)
         self.assertEqual(to_unixtime(dt_dst_naive, "Europe/London"), 1585481696)
+        self.assertEqual(to_unixtime(dt_no_dst_naive, "UTC"), 1585398896)
+        self.assertEqual(to_unixtime(dt_dst_naive, "UTC"), 1585485296)
         # Test validations
         self.assertRaises(Exception, to_unixtime, dt_no_dst_naive)
         self.assertRaises(Exception, to_unixtime, dt_dst_naive)
@@ -207,6 +213,7 @@ class sp2tsTestCase(unittest.TestCase):
             {"sp": (date(2021, 3, 27), "1"), "error": TypeError},
             {"sp": (date(2021, 3, 27), "one"), "error": TypeError},
             {"sp": (date(2021, 3, 27), 1.0), "error": TypeError},
+            {"sp": (date(2021, 3, 27), True), "error": TypeError},
             # Date is not datetime.date -> TypeError
             {"sp": ("date(2021, 3, 27)", 1), "error": TypeError},
             {"sp": ("2021-03-21", 1), "error": TypeError},
@@ -240,10 +247,13 @@ class sp2tsTestCase(unittest.TestCase):
         for testval in TEST_VALUES:
             with self.subTest(test_type="values", ts=testval["ts"]):
                 self.assertEqual(ts2sp(testval["ts"]), testval["sp"])
+            with self.subTest(test_type="numpy values", ts=testval["ts"]):
+                self.assertEqual(ts2sp(np.int64(testval["ts"])), testval["sp"])
         error_test_values = [
             # TS is not int -> TypeError
             {"ts": "1585396800", "error": TypeError},
             {"ts": 1585396800.0, "error": TypeError},
+            {"ts": True, "error": TypeError},
             {"ts": datetime(2020, 3, 28, 12, tzinfo=pytz.utc), "error": TypeError},
             # TS does not fall on 30 min interval -> ValueError
             {"ts": 1585396799, "error": ValueError},
@@ -260,6 +270,105 @@ class sp2tsTestCase(unittest.TestCase):
             with self.subTest(test_type="errors", sp=testval["ts"]):
                 with self.assertRaises(testval["error"]):
                     ts2sp(testval["ts"])
+        # The error message should name the offending parameter
+        with self.assertRaisesRegex(ValueError, "`timestamp_`"):
+            ts2sp(-1800)
+
+    def test_sp2ts_batch(self):
+        """
+        Test the `sp2ts_batch()` function.
+
+        Use TEST_VALUES and check for consistency with `sp2ts()` for each value of `closed`, then
+        test raise error on bad SPs or types.
+        """
+        dates = [testval["sp"][0] for testval in TEST_VALUES]
+        sps = [testval["sp"][1] for testval in TEST_VALUES]
+        expected = np.array([testval["ts"] for testval in TEST_VALUES])
+        np.testing.assert_array_equal(sp2ts_batch(dates, sps), expected)
+        for closed in ("left", "middle", "right"):
+            with self.subTest(test_type="closed", closed=closed):
+                np.testing.assert_array_equal(
+                    sp2ts_batch(dates, sps, closed=closed),
+                    [sp2ts(d, sp, closed=closed) for d, sp in zip(dates, sps)]
+                )
+        empty = sp2ts_batch([], [])
+        self.assertEqual((empty.dtype, empty.shape), (np.dtype(np.int64), (0,)))
+        error_test_values = [
+            {"sp": ([date(2021, 3, 27)], [1.0]), "error": TypeError},
+            {"sp": ([date(2021, 3, 27)], ["1"]), "error": TypeError},
+            {"sp": ([date(2021, 3, 27)], [0]), "error": ValueError},
+            {"sp": ([date(2021, 3, 28)], [47]), "error": ValueError},
+            {"sp": ([date(2021, 10, 31)], [51]), "error": ValueError},
+            {"sp": ([date(1990, 3, 24)], [1]), "error": ValueError},
+            {"sp": ([datetime(2021, 3, 27, 23)], [1]), "error": TypeError},
+            {"sp": ([datetime(2021, 3, 27)], [1]), "error": TypeError},
+            {"sp": (["2021-03-27T23:00"], [1]), "error": TypeError},
+            {"sp": (np.array(["2021-03-27T23"], dtype="datetime64[h]"), [1]), "error": TypeError},
+            {"sp": ([18700], [1]), "error": TypeError},
+            {"sp": ([18700.5], [1]), "error": TypeError},
+            {"sp": ([True], [1]), "error": TypeError},
+        ]
+        for testval in error_test_values:
+            with self.subTest(test_type="errors", sp=testval["sp"]):
+                with self.assertRaises(testval["error"]):
+                    sp2ts_batch(*testval["sp"])
+
+    def test_ts2sp_batch(self):
+        """
+        Test the `ts2sp_batch()` function.
+
+        Use TEST_VALUES and also test raise error on bad timestamps or types.
+        """
+        dates, sps = ts2sp_batch([testval["ts"] for testval in TEST_VALUES])
+        np.testing.assert_array_equal(
+            dates, np.array([testval["sp"][0] for testval in TEST_VALUES], dtype="datetime64[D]")
+        )
+        np.testing.assert_array_equal(sps, [testval["sp"][1] for testval in TEST_VALUES])
+        dates, sps = ts2sp_batch([])
+        self.assertEqual((dates.dtype, dates.shape), (np.dtype("datetime64[D]"), (0,)))
+        self.assertEqual((sps.dtype, sps.shape), (np.dtype(np.int64), (0,)))
+        error_test_values = [
+            {"ts": [1585396800.0], "error": TypeError},
+            {"ts": ["1585396800"], "error": TypeError},
+            {"ts": [1585396799], "error": ValueError},
+            {"ts": [638321400], "error": ValueError},
+            {"ts": [2140043400], "error": ValueError},
+        ]
+        for testval in error_test_values:
+            with self.subTest(test_type="errors", ts=testval["ts"]):
+                with self.assertRaises(testval["error"]):
+                    ts2sp_batch(testval["ts"])
+
+    def test_parse_cli_dates(self):
+        """
+        Test the CLI date and datetime parsers accept only the documented formats.
+        """
+        self.assertEqual(sp2ts_module._parse_date("2021-03-28"), date(2021, 3, 28))
+        self.assertEqual(sp2ts_module._parse_datetime("2021-03-28T12:34:56"),
+                         datetime(2021, 3, 28, 12, 34, 56))
+        for date_str in ("20210328", "2021-W12-7", "2021-02-30"):
+            with self.subTest(test_type="date errors", date_str=date_str):
+                with self.assertRaises(ValueError):
+                    sp2ts_module._parse_date(date_str)
+        for dt_str in ("2021-03-28T12", "2021-03-28T12:00:00+05:00", "2021-03-28T12:00:00.5"):
+            with self.subTest(test_type="datetime errors", dt_str=dt_str):
+                with self.assertRaises(ValueError):
+                    sp2ts_module._parse_datetime(dt_str)
+
+    @unittest.skipIf(sp2ts_module._sp2ts is None, "C extension is not built")
+    def test_c_extension(self):
+        """
+        Test that the C extension gives identical results to the pure Python implementations of
+        the `sp2ts()` and `ts2sp()` cores for every settlement period in the supported range.
+        """
+        c_ext = sp2ts_module._sp2ts
+        for date_ts in range(sp2ts_module.TRANSITION_DATES_TS[0][0],
+                             sp2ts_module.TRANSITION_DATES_TS[-1][1] + 1, 86400):
+            for sp_ in (1, 2, 3, 24, 45, 46, 47, 48, 49, 50):
+                timestamp_ = sp2ts_module._sp2ts_core_py(date_ts, sp_)
+                self.assertEqual(c_ext.sp2ts_core(date_ts, sp_), timestamp_)
+                self.assertEqual(c_ext.ts2sp_core(timestamp_),
+                                 sp2ts_module._ts2sp_core_py(timestamp_))
 
 if __name__ == "__main__":
     unittest.main()
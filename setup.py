@@ -0,0 +1,9 @@
+"""
+Build the optional C extension. All other package metadata lives in pyproject.toml.
+"""
+
+from setuptools import setup, Extension
+
+setup(
+    ext_modules=[Extension("sp2ts._sp2ts", sources=["sp2ts/_sp2ts.c"], optional=True)],
+)
@@ -1,3 +1,5 @@
-from sp2ts.sp2ts import sp2ts, to_unixtime, from_unixtime, sp2dt, ts2sp, dt2sp
+from sp2ts.sp2ts import (sp2ts, to_unixtime, from_unixtime, sp2dt, ts2sp, dt2sp, sp2ts_batch,
+                         ts2sp_batch)
 
-__all__ = ["sp2ts", "to_unixtime", "from_unixtime", "sp2dt", "ts2sp", "dt2sp"]
+__all__ = ["sp2ts", "to_unixtime", "from_unixtime", "sp2dt", "ts2sp", "dt2sp", "sp2ts_batch",
+           "ts2sp_batch"]
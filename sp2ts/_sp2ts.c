@@ -0,0 +1,155 @@
+/*
+ * C implementation of the integer cores of sp2ts() and ts2sp(). The pure Python equivalents in
+ * sp2ts.py are used instead if this extension has not been built.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/*
+ * Per-day lookup tables, set once from sp2ts.py at import by set_tables() so that the C and
+ * Python cores always share the same transition data. Both tables are indexed by days since the
+ * Unix epoch minus days_offset and hold one byte per day: bst_days is 1 for days whose
+ * settlement periods are in BST and max_sp_days is the number of settlement periods in the day.
+ * The bytes objects are kept referenced for the lifetime of the module.
+ */
+static PyObject *bst_days_obj = NULL;
+static PyObject *max_sp_days_obj = NULL;
+static const unsigned char *bst_days = NULL;
+static const unsigned char *max_sp_days = NULL;
+static long long days_offset = 0;
+static Py_ssize_t n_days = 0;
+
+/* Index into the per-day tables for the given day, or -1 (with an exception set) if out of range */
+static Py_ssize_t
+day_index(long long days)
+{
+    long long index;
+    if (bst_days == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "set_tables() has not been called");
+        return -1;
+    }
+    index = days - days_offset;
+    if (index < 0 || index >= n_days) {
+        PyErr_SetString(PyExc_ValueError, "Day is outside the range of the transition tables");
+        return -1;
+    }
+    return (Py_ssize_t)index;
+}
+
+static PyObject *
+set_tables(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    long long offset;
+    if (nargs != 3) {
+        PyErr_SetString(PyExc_TypeError, "set_tables expects exactly 3 arguments");
+        return NULL;
+    }
+    offset = PyLong_AsLongLong(args[0]);
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    if (!PyBytes_Check(args[1]) || !PyBytes_Check(args[2])) {
+        PyErr_SetString(PyExc_TypeError, "set_tables expects the tables as bytes");
+        return NULL;
+    }
+    if (PyBytes_GET_SIZE(args[1]) != PyBytes_GET_SIZE(args[2])) {
+        PyErr_SetString(PyExc_ValueError, "The BST and max SP tables must be the same length");
+        return NULL;
+    }
+    Py_INCREF(args[1]);
+    Py_INCREF(args[2]);
+    Py_XSETREF(bst_days_obj, args[1]);
+    Py_XSETREF(max_sp_days_obj, args[2]);
+    bst_days = (const unsigned char *)PyBytes_AS_STRING(bst_days_obj);
+    max_sp_days = (const unsigned char *)PyBytes_AS_STRING(max_sp_days_obj);
+    days_offset = offset;
+    n_days = PyBytes_GET_SIZE(bst_days_obj);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+sp2ts_core(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    long long date_ts, sp, timestamp;
+    Py_ssize_t index;
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "sp2ts_core expects exactly 2 arguments");
+        return NULL;
+    }
+    date_ts = PyLong_AsLongLong(args[0]);
+    sp = PyLong_AsLongLong(args[1]);
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    /* Dates are validated to be within the supported range by the caller, so date_ts > 0 */
+    index = day_index(date_ts / 86400);
+    if (index < 0) {
+        return NULL;
+    }
+    timestamp = date_ts + 1800 * sp;
+    if (bst_days[index]) {
+        timestamp -= 3600;
+    }
+    return PyLong_FromLongLong(timestamp);
+}
+
+static PyObject *
+ts2sp_core(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    long long timestamp, days, sp, day_max_sp;
+    Py_ssize_t index;
+    if (nargs != 1) {
+        PyErr_SetString(PyExc_TypeError, "ts2sp_core expects exactly 1 argument");
+        return NULL;
+    }
+    timestamp = PyLong_AsLongLong(args[0]);
+    if (PyErr_Occurred()) {
+        return NULL;
+    }
+    /* Timestamps are validated to be positive by the caller, so C division is floor division */
+    /* Shift back one second so that midnight falls in the last SP of the previous day */
+    timestamp -= 1;
+    days = timestamp / 86400;
+    index = day_index(days);
+    if (index < 0) {
+        return NULL;
+    }
+    sp = (timestamp % 86400) / 1800 + 1;
+    if (bst_days[index]) {
+        sp += 2;
+    }
+    day_max_sp = max_sp_days[index];
+    if (sp > day_max_sp) {
+        days += 1;
+        sp -= day_max_sp;
+    }
+    return Py_BuildValue("(LL)", days, sp);
+}
+
+static PyMethodDef sp2ts_methods[] = {
+    {"set_tables", (PyCFunction)(void (*)(void))set_tables, METH_FASTCALL,
+     "set_tables(days_offset, bst_days, max_sp_days)\n--\n\nSet the per-day BST and max SP "
+     "tables (bytes, indexed by days since epoch minus `days_offset`)."},
+    {"sp2ts_core", (PyCFunction)(void (*)(void))sp2ts_core, METH_FASTCALL,
+     "sp2ts_core(date_ts, sp)\n--\n\nUnix timestamp at the end of SP `sp` on the day starting at "
+     "`date_ts`."},
+    {"ts2sp_core", (PyCFunction)(void (*)(void))ts2sp_core, METH_FASTCALL,
+     "ts2sp_core(timestamp)\n--\n\nTuple of (days since epoch, sp) for the SP ending at "
+     "`timestamp`."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef sp2ts_module = {
+    PyModuleDef_HEAD_INIT,
+    "_sp2ts",
+    "C implementation of the sp2ts integer cores.",
+    -1,
+    sp2ts_methods
+};
+
+PyMODINIT_FUNC
+PyInit__sp2ts(void)
+{
+    return PyModule_Create(&sp2ts_module);
+}
@@ -3,22 +3,28 @@ Utility for generating a list of transition date timestamps for use in sp2ts.
 Always test the outputs carefully in case there have been changes in the behvaiour of pytz or
 datetime!
 
+The timestamps are saved to _transition_dates.npy, which sp2ts loads at import and which is the
+only copy of the transition dates. They are also printed with their dates for checking.
+
+This script must never import the sp2ts package: importing it loads and validates
+_transition_dates.npy, so a missing or broken file would stop the one tool that can rebuild it.
+
 Jamie Taylor
 2024-02-20
 """
 
-from datetime import datetime, time
+import os
+import calendar
 from pytz import timezone
 
+import numpy as np
 import pandas as pd
 
-from sp2ts import to_unixtime
-
 
 def main():
     tz = timezone("Europe/London")
     transition_dates = pd.DataFrame([
-        [d.year, d.date(), to_unixtime(datetime.combine(d.date(), time(0)), timezone_="UTC")]
+        [d.year, d.date(), calendar.timegm(d.date().timetuple())]
         for d in tz._utc_transition_times[20:]
     ], columns=["year", "transition_date", "transition_date_ts"])
     transition_dates = transition_dates.loc[(transition_dates.year >= 1990)]
@@ -29,11 +35,10 @@ def main():
                                         .reset_index()\
                                         .reset_index()\
                                         .values
-    print(
-        "TRANSITION_DATES_TS = [\r\n   ",
-        "\r\n    ".join([f"({t[4]}, {t[5]}), # {t[1]}: {t[2]}, {t[3]}" for t in transition_dates_]),
-        "\r\n]"
-    )
+    np.save(os.path.join(os.path.dirname(os.path.abspath(__file__)), "_transition_dates.npy"),
+            np.array([(t[4], t[5]) for t in transition_dates_], dtype=np.int64))
+    for t in transition_dates_:
+        print(f"{t[1]}: {t[2]}, {t[3]} ({t[4]}, {t[5]})")
 
 
 if __name__ == "__main__":
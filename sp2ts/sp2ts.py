@@ -9,63 +9,62 @@ timestamps and Python datetime objects.
 """
 
 from typing import Optional, Tuple
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, timezone
+import calendar
+from functools import lru_cache
 import argparse
+import os
 
-import pytz
 import numpy as np
 
-# See get_transition_dates.py
-TRANSITION_DATES_TS = [
-    (638323200, 657072000),  # 1990: 1990-03-25, 1990-10-28
-    (670377600, 688521600),  # 1991: 1991-03-31, 1991-10-27
-    (701827200, 719971200),  # 1992: 1992-03-29, 1992-10-25
-    (733276800, 751420800),  # 1993: 1993-03-28, 1993-10-24
-    (764726400, 782870400),  # 1994: 1994-03-27, 1994-10-23
-    (796176000, 814320000),  # 1995: 1995-03-26, 1995-10-22
-    (828230400, 846374400),  # 1996: 1996-03-31, 1996-10-27
-    (859680000, 877824000),  # 1997: 1997-03-30, 1997-10-26
-    (891129600, 909273600),  # 1998: 1998-03-29, 1998-10-25
-    (922579200, 941328000),  # 1999: 1999-03-28, 1999-10-31
-    (954028800, 972777600),  # 2000: 2000-03-26, 2000-10-29
-    (985478400, 1004227200),  # 2001: 2001-03-25, 2001-10-28
-    (1017532800, 1035676800),  # 2002: 2002-03-31, 2002-10-27
-    (1048982400, 1067126400),  # 2003: 2003-03-30, 2003-10-26
-    (1080432000, 1099180800),  # 2004: 2004-03-28, 2004-10-31
-    (1111881600, 1130630400),  # 2005: 2005-03-27, 2005-10-30
-    (1143331200, 1162080000),  # 2006: 2006-03-26, 2006-10-29
-    (1174780800, 1193529600),  # 2007: 2007-03-25, 2007-10-28
-    (1206835200, 1224979200),  # 2008: 2008-03-30, 2008-10-26
-    (1238284800, 1256428800),  # 2009: 2009-03-29, 2009-10-25
-    (1269734400, 1288483200),  # 2010: 2010-03-28, 2010-10-31
-    (1301184000, 1319932800),  # 2011: 2011-03-27, 2011-10-30
-    (1332633600, 1351382400),  # 2012: 2012-03-25, 2012-10-28
-    (1364688000, 1382832000),  # 2013: 2013-03-31, 2013-10-27
-    (1396137600, 1414281600),  # 2014: 2014-03-30, 2014-10-26
-    (1427587200, 1445731200),  # 2015: 2015-03-29, 2015-10-25
-    (1459036800, 1477785600),  # 2016: 2016-03-27, 2016-10-30
-    (1490486400, 1509235200),  # 2017: 2017-03-26, 2017-10-29
-    (1521936000, 1540684800),  # 2018: 2018-03-25, 2018-10-28
-    (1553990400, 1572134400),  # 2019: 2019-03-31, 2019-10-27
-    (1585440000, 1603584000),  # 2020: 2020-03-29, 2020-10-25
-    (1616889600, 1635638400),  # 2021: 2021-03-28, 2021-10-31
-    (1648339200, 1667088000),  # 2022: 2022-03-27, 2022-10-30
-    (1679788800, 1698537600),  # 2023: 2023-03-26, 2023-10-29
-    (1711843200, 1729987200),  # 2024: 2024-03-31, 2024-10-27
-    (1743292800, 1761436800),  # 2025: 2025-03-30, 2025-10-26
-    (1774742400, 1792886400),  # 2026: 2026-03-29, 2026-10-25
-    (1806192000, 1824940800),  # 2027: 2027-03-28, 2027-10-31
-    (1837641600, 1856390400),  # 2028: 2028-03-26, 2028-10-29
-    (1869091200, 1887840000),  # 2029: 2029-03-25, 2029-10-28
-    (1901145600, 1919289600),  # 2030: 2030-03-31, 2030-10-27
-    (1932595200, 1950739200),  # 2031: 2031-03-30, 2031-10-26
-    (1964044800, 1982793600),  # 2032: 2032-03-28, 2032-10-31
-    (1995494400, 2014243200),  # 2033: 2033-03-27, 2033-10-30
-    (2026944000, 2045692800),  # 2034: 2034-03-26, 2034-10-29
-    (2058393600, 2077142400),  # 2035: 2035-03-25, 2035-10-28
-    (2090448000, 2108592000),  # 2036: 2036-03-30, 2036-10-26
-    (2121897600, 2140041600),  # 2037: 2037-03-29, 2037-10-25
-]
+try:
+    from sp2ts import _sp2ts
+except ImportError:  # The C extension is optional, fall back to pure Python
+    _sp2ts = None
+
+_SEC_PER_DAY = 86400
+_SEC_PER_HOUR = 3600
+_SEC_PER_SP = 1800
+# Midnight UTC timestamps of the spring and autumn clock-change days for each supported year, as
+# an int64 array of shape (n_years, 2). The bundled file is the single source of truth for the
+# transition dates - regenerate it with get_transition_dates.py rather than editing anything here.
+_TR = np.load(os.path.join(os.path.dirname(__file__), "_transition_dates.npy"))
+if _TR.ndim != 2 or _TR.shape[1] != 2 or not np.issubdtype(_TR.dtype, np.integer):
+    raise ValueError(f"_transition_dates.npy must be an integer array of shape (n, 2), got "
+                     f"{_TR.dtype} {_TR.shape}")
+_TR = _TR.astype(np.int64)
+if np.any(_TR % _SEC_PER_DAY != 0) or np.any(np.diff(_TR.ravel()) <= 0):
+    raise ValueError("_transition_dates.npy must contain strictly increasing midnight timestamps")
+# Public (start, end) pairs for backward compatibility; the lookups use the arrays below
+TRANSITION_DATES_TS = tuple((int(start), int(end)) for start, end in _TR)
+_TR_STARTS = np.ascontiguousarray(_TR[:, 0])
+_TR_ENDS = np.ascontiguousarray(_TR[:, 1])
+# First and last supported timestamps as plain ints, for range checks
+_MIN_TS = int(_TR_STARTS[0])
+_MAX_TS = int(_TR_ENDS[-1])
+# Dense per-day tables, indexed by days since the epoch minus _DAYS_OFFSET. They start the day
+# before the first transition because ts2sp looks up the day of timestamp_ - 1.
+_DAYS_OFFSET = _MIN_TS // _SEC_PER_DAY - 1
+_DAY_TS = np.arange(_DAYS_OFFSET, _MAX_TS // _SEC_PER_DAY + 1, dtype=np.int64) * _SEC_PER_DAY
+# Whether each day's settlement periods are in BST, i.e. start < ts <= end (an odd searchsorted
+# insertion point over the flat boundaries [start_0, end_0, start_1, end_1, ...])
+_BST_BY_DAY = np.searchsorted(_TR.ravel(), _DAY_TS) % 2 == 1
+# Number of settlement periods in each day: 46 on the short (spring) day, 50 on the long one
+_MAX_SP_BY_DAY = np.full(len(_DAY_TS), 48, dtype=np.int64)
+_MAX_SP_BY_DAY[_TR_STARTS // _SEC_PER_DAY - _DAYS_OFFSET] = 46
+_MAX_SP_BY_DAY[_TR_ENDS // _SEC_PER_DAY - _DAYS_OFFSET] = 50
+# bytes copies of the tables for the scalar path, where indexing yields a plain Python int
+_BST_DAYS = _BST_BY_DAY.astype(np.uint8).tobytes()
+_MAX_SP_DAYS = _MAX_SP_BY_DAY.astype(np.uint8).tobytes()
+_UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MIN_DATE = date.fromordinal(_UNIX_EPOCH_ORDINAL + _MIN_TS // _SEC_PER_DAY)
+_MAX_DATE = date.fromordinal(_UNIX_EPOCH_ORDINAL + _MAX_TS // _SEC_PER_DAY)
+# Seconds from the start of the settlement day to the end of each SP (ignoring clock changes)
+_SP_SECONDS = tuple(sp_ * _SEC_PER_SP for sp_ in range(51))
+# Types accepted as integer timestamps (np.integer covers every NumPy integer width)
+_INT_TYPES = (int, np.integer)
+# Seconds to subtract from the end of a settlement period for each value of `closed`
+_CLOSED_OFFSET = {"right": 0, "middle": _SEC_PER_SP // 2, "left": _SEC_PER_SP}
 
 
 def to_unixtime(datetime_: datetime, timezone_: Optional[str] = None) -> int:
@@ -95,11 +94,14 @@ def to_unixtime(datetime_: datetime, timezone_: Optional[str] = None) -> int:
     if not timezone_ and not datetime_.tzinfo:
         raise Exception("EITHER datetime_ must contain tzinfo OR timezone_ must be passed.")
     if timezone_ and not datetime_.tzinfo:
-        utc_datetime = pytz.timezone(timezone_).localize(datetime_).astimezone(pytz.utc)
-    else:
-        utc_datetime = datetime_.astimezone(pytz.utc)
-    unixtime = int((utc_datetime - datetime(1970, 1, 1, 0, 0, 0, 0, pytz.utc)).total_seconds())
-    return unixtime
+        if timezone_ == "UTC":
+            # Naive UTC needs no localisation, so skip pytz and use integer arithmetic
+            days = datetime_.toordinal() - _UNIX_EPOCH_ORDINAL
+            seconds = datetime_.hour * _SEC_PER_HOUR + datetime_.minute * 60 + datetime_.second
+            return days * _SEC_PER_DAY + seconds
+        datetime_ = _tz(timezone_).localize(datetime_)
+    # utctimetuple() applies the UTC offset itself, so there is no need to convert to UTC first
+    return calendar.timegm(datetime_.utctimetuple())
 
 
 def from_unixtime(timestamp_: int, timezone_: str = "UTC") -> datetime:
@@ -119,13 +121,19 @@ def from_unixtime(timestamp_: int, timezone_: str = "UTC") -> datetime:
     Notes
     -----
     unixtime == seconds since epoch (Jan 01 1970 00:00:00 UTC)\n
+    For the default *timezone_* of "UTC" the tzinfo is the standard library's
+    `datetime.timezone.utc`, not `pytz.utc`, so pytz-only methods such as `localize()` and
+    `normalize()` (and the `zone` attribute) are not available on it. Other timezones use pytz.\n
     pytz http://pythonhosted.org/pytz/\n
     """
     _validate_timestamp("timestamp_", timestamp_)
     _validate_timezone("timezone_", timezone_)
-    return datetime.fromtimestamp(timestamp_, tz=pytz.timezone(timezone_))
+    if timezone_ == "UTC":
+        return datetime.fromtimestamp(timestamp_, tz=timezone.utc)
+    return datetime.fromtimestamp(timestamp_, tz=_tz(timezone_))
 
 
+@lru_cache(maxsize=32768, typed=True)
 def sp2ts(date_: date, sp_: int, closed: str = "right") -> int:
     """
     Convert a date and settlement period into a unix timestamp for the start or end of the
@@ -148,26 +156,19 @@ def sp2ts(date_: date, sp_: int, closed: str = "right") -> int:
     Notes
     -----
     unixtime == seconds since epoch (Jan 01 1970 00:00:00 UTC)\n
+    The most recent 32768 results are cached, which speeds up repeated conversions. To convert
+    many distinct values, `sp2ts_batch()` is much faster.
     """
     _validate_date("date_", date_)
-    _validate_sp("sp_", sp_, date_)
-    _validate_closed("closed", closed)
-    min_date = from_unixtime(TRANSITION_DATES_TS[0][0]).date()
-    max_date = from_unixtime(TRANSITION_DATES_TS[-1][1]).date()
-    if date_ < min_date or date_ > max_date:
+    # Compute the day number once and share it between SP validation and the conversion itself
+    days = date_.toordinal() - _UNIX_EPOCH_ORDINAL
+    _validate_sp("sp_", sp_, date_, days)
+    closed = _validate_closed("closed", closed)
+    if date_ < _MIN_DATE or date_ > _MAX_DATE:
         raise ValueError(f"`date_` is outside supported range: {date_.isoformat()} (supported "
-                         f"range is {min_date.isoformat()} <= date_ <= {max_date.isoformat()}")
-    date_ts = to_unixtime(datetime.combine(date_, time()), "UTC")
-    ts_raw = date_ts + 30 * 60 * int(sp_)
-    if any(x[0] < date_ts <= x[1] for x in TRANSITION_DATES_TS):
-        timestamp_ = ts_raw - 3600
-    else:
-        timestamp_ = ts_raw
-    if closed.lower() == "left":
-        timestamp_ -= 1800
-    elif closed.lower() == "middle":
-        timestamp_ -= 900
-    return timestamp_
+                         f"range is {_MIN_DATE.isoformat()} <= date_ <= {_MAX_DATE.isoformat()}")
+    timestamp_ = _sp2ts_core(days * _SEC_PER_DAY, sp_)
+    return timestamp_ - _CLOSED_OFFSET[closed]
 
 
 def sp2dt(date_: date, sp_: int, closed: str = "right") -> datetime:
@@ -188,11 +189,12 @@ def sp2dt(date_: date, sp_: int, closed: str = "right") -> datetime:
     Returns
     -------
     datetime.datetime
-        Timezone-aware Python datetime object in UTC.
+        Timezone-aware Python datetime object in UTC, with tzinfo `datetime.timezone.utc`.
     """
     return from_unixtime(sp2ts(date_, sp_, closed))
 
 
+@lru_cache(maxsize=32768, typed=True)
 def ts2sp(timestamp_: int) -> Tuple[date, int]:
     """
     Convert a unix timestamp into a date and settlement period. Settlent periods are considered to
@@ -208,34 +210,19 @@ def ts2sp(timestamp_: int) -> Tuple[date, int]:
         A tuple containing (date, sp) where date is a Python date object and sp is an int.
     Notes
     -----
-    This logic is horrible! Hopefully it can be refined and made more performant in a future
-    release.
+    The timestamp is shifted back by one second before dividing into days and SPs, so that a
+    timestamp at the end of an SP (including midnight) falls within that SP.\n
+    The most recent 32768 results are cached, which speeds up repeated conversions. To convert
+    many distinct values, `ts2sp_batch()` is much faster.
     """
     _validate_timestamp("timestamp_", timestamp_)
-    if timestamp_ < TRANSITION_DATES_TS[0][0] or timestamp_ > TRANSITION_DATES_TS[-1][1]:
+    if timestamp_ < _MIN_TS or timestamp_ > _MAX_TS:
         raise ValueError(f"`timestamp_` is outside supported range: {timestamp_} (supported range "
-                         f"is {TRANSITION_DATES_TS[0][0]} <= timestamp_ <= "
-                         f"{TRANSITION_DATES_TS[-1][1]}")
-    if timestamp_ % 1800 != 0:
+                         f"is {_MIN_TS} <= timestamp_ <= {_MAX_TS}")
+    if timestamp_ % _SEC_PER_SP != 0:
         raise ValueError(f"`timestamp_` does not fall on settlement period boundary: {timestamp_}")
-    d_ts = (timestamp_ // 86400) * 86400
-    date_ = from_unixtime(timestamp_).date()
-    hours = (timestamp_ % 86400) / 3600.
-    sp_ = int(hours / 0.5)
-    if any(x[0] < d_ts <= x[1] for x in TRANSITION_DATES_TS):
-        # Add an hour for BST
-        sp_ += 2
-    if sp_ == 0:
-        # If it's 00:00:00+00:00, sp_ will be 0 - need to subtract a day from date_ and
-        # set SP to max_sp for day-1
-        date_ -= timedelta(days=1)
-        sp_ = _max_sp(date_)
-    # If our SP exceeds the max SP for the date, add 1 day and reset SP to 1 or 2
-    max_sp = _max_sp(date_)
-    if sp_ > max_sp:
-        date_ += timedelta(days=1)
-        sp_ -= max_sp
-    return (date_, sp_)
+    days, sp_ = _ts2sp_core(int(timestamp_))
+    return (date.fromordinal(_UNIX_EPOCH_ORDINAL + days), sp_)
 
 
 def dt2sp(datetime_: datetime, timezone_: Optional[str] = None) -> Tuple[date, int]:
@@ -264,6 +251,102 @@ def dt2sp(datetime_: datetime, timezone_: Optional[str] = None) -> Tuple[date, i
     return ts2sp(to_unixtime(datetime_, timezone_))
 
 
+def sp2ts_batch(dates, sps, closed: str = "right") -> np.ndarray:
+    """
+    Convert arrays of dates and settlement periods into unix timestamps for the start or end of
+    each settlement period. This is the vectorised equivalent of `sp2ts()`.
+
+    Parameters
+    ----------
+    `dates` : array-like
+        Array of dates, either as Python date objects or as anything NumPy can convert to
+        `datetime64[D]`. As with `sp2ts()`, datetimes and numbers are rejected.
+    `sps` : array-like
+        Array of integer settlement periods, broadcastable against `dates`.
+    `closed` : str
+        Set to 'right' to return the timestamps at the end of the settlement periods, 'middle' to
+        return the timestamps at the centre of the settlement periods, or 'left' to return the
+        timestamps at the start of the settlement periods.
+    Returns
+    -------
+    numpy.ndarray
+        Array of unix timestamps (int64).
+    """
+    closed = _validate_closed("closed", closed)
+    dates = np.asarray(dates)
+    if dates.size == 0:
+        # np.asarray([]) is float64, so give empty input the dtype it would have had
+        dates = dates.astype("datetime64[D]")
+    if dates.dtype.kind in "OSU":
+        # Let NumPy infer the unit, so that datetimes (and strings with a time) are not truncated
+        dates = dates.astype("datetime64")
+    # Like sp2ts(), accept only dates: numbers and datetimes are rejected rather than reinterpreted
+    if dates.dtype.kind != "M" or np.datetime_data(dates.dtype)[0] != "D":
+        raise TypeError(f"`dates` must contain dates, not datetimes or numbers (got dtype "
+                        f"{dates.dtype})")
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    date_ts = days * _SEC_PER_DAY
+    sps = np.asarray(sps)
+    if sps.size and not np.issubdtype(sps.dtype, np.integer):
+        raise TypeError("`sps` must be an array of integers")
+    sps = sps.astype(np.int64)
+    if np.any((date_ts < _MIN_TS) | (date_ts > _MAX_TS)):
+        raise ValueError("`dates` contains dates outside supported range (supported range is "
+                         f"{_MIN_DATE.isoformat()} <= date_ <= {_MAX_DATE.isoformat()})")
+    if np.any((sps < 1) | (sps > _max_sp_batch(days))):
+        raise ValueError("`sps` contains settlement periods which do not exist on the "
+                         "corresponding date")
+    timestamps = date_ts + _SEC_PER_SP * sps - _SEC_PER_HOUR * _in_bst_batch(days)
+    return timestamps - _CLOSED_OFFSET[closed]
+
+
+def ts2sp_batch(timestamps) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert an array of unix timestamps into dates and settlement periods. This is the vectorised
+    equivalent of `ts2sp()`; settlement periods are considered to be "closed right".
+
+    Parameters
+    ----------
+    `timestamps` : array-like
+        Array of integer unix timestamps.
+    Returns
+    -------
+    tuple
+        A tuple containing (dates, sps) where dates is a NumPy array of `datetime64[D]` and sps is
+        a NumPy array of int64.
+    """
+    timestamps = np.asarray(timestamps)
+    # Empty input defaults to float64, so only check the dtype when there are values
+    if timestamps.size and not np.issubdtype(timestamps.dtype, np.integer):
+        raise TypeError("`timestamps` must be an array of integers")
+    timestamps = timestamps.astype(np.int64)
+    if np.any((timestamps < _MIN_TS) | (timestamps > _MAX_TS)):
+        raise ValueError("`timestamps` contains values outside supported range (supported range "
+                         f"is {_MIN_TS} <= timestamp_ <= {_MAX_TS})")
+    if np.any(timestamps % _SEC_PER_SP != 0):
+        raise ValueError("`timestamps` contains values which do not fall on a settlement period "
+                         "boundary")
+    days = timestamps // _SEC_PER_DAY
+    sps = (timestamps % _SEC_PER_DAY) // _SEC_PER_SP + 2 * _in_bst_batch(days)
+    # Midnight UTC belongs to the final SP of the previous day
+    midnight = sps == 0
+    days = days - midnight
+    sps = np.where(midnight, _max_sp_batch(days), sps)
+    # SPs beyond the end of a (BST) day roll over into the next day
+    max_sps = _max_sp_batch(days)
+    overflow = sps > max_sps
+    days = days + overflow
+    sps = np.where(overflow, sps - max_sps, sps)
+    return days.astype("datetime64[D]"), sps
+
+
+@lru_cache(maxsize=None)
+def _tz(timezone_):
+    # pytz is only needed for named zones other than UTC, so defer importing it until then
+    import pytz
+    return pytz.timezone(timezone_)
+
+
 def _validate_datetime(name, datetime_, require_tzinfo=False):
     if not isinstance(datetime_, datetime):
         raise TypeError(f"`{name}` must be of type datetime.datetime")
@@ -273,53 +356,108 @@ def _validate_datetime(name, datetime_, require_tzinfo=False):
 
 
 def _validate_date(name, date_):
-    if not isinstance(date_, date):
+    if not isinstance(date_, date) or isinstance(date_, datetime):
         raise TypeError(f"`{name}` must be of type datetime.date")
 
 
 def _validate_timezone(name, timezone_):
     if timezone_ is not None and not isinstance(timezone_, str):
         raise TypeError(f"`{name}` must be of type string")
-    # try:
-        # tzinfo = pytz.timezone(timezone_)
-    # except pytz.exceptions.UnknownTimeZoneError:
-        # raise ValueError(f"Unknown timezone '{timezone_}'")
 
 
 def _validate_timestamp(name, timestamp_):
-    if not isinstance(timestamp_, (int, np.int32, np.int64)):
-        raise TypeError(f"`{name}` must be of type int")
+    # Plain ints are by far the most common input, so only fall back to isinstance for the rest
+    if type(timestamp_) is not int:
+        if isinstance(timestamp_, bool) or not isinstance(timestamp_, _INT_TYPES):
+            raise TypeError(f"`{name}` must be of type int")
     if timestamp_ < 0:
-        raise ValueError("Inavalid value for `{name}`, Unix timestamps cannot be negative")
+        raise ValueError(f"Invalid value for `{name}`: Unix timestamps cannot be negative")
 
 
 def _validate_closed(name, closed):
     if not isinstance(closed, str):
         raise TypeError(f"`{name}` must be of type string")
-    if closed.lower() not in ("right", "left", "middle"):
+    closed = closed.lower()
+    if closed not in _CLOSED_OFFSET:
         raise ValueError("The `closed` parameter should be either 'right', 'left' or 'middle'")
+    return closed
+
+
+def _max_sp_core(days):
+    index = days - _DAYS_OFFSET
+    if 0 <= index < len(_MAX_SP_DAYS):
+        return _MAX_SP_DAYS[index]
+    # Outside the supported range, which callers reject separately
+    return 48
+
+
+def _sp2ts_core_py(date_ts, sp_):
+    ts_raw = date_ts + _SP_SECONDS[sp_]
+    if _BST_DAYS[date_ts // _SEC_PER_DAY - _DAYS_OFFSET]:
+        return ts_raw - _SEC_PER_HOUR
+    return ts_raw
 
 
-def _max_sp(date_):
-    date_ts = to_unixtime(datetime.combine(date_, time()), "UTC")
-    if date_ts in [x[0] for x in TRANSITION_DATES_TS]:
-        max_sp = 46
-    elif date_ts in [x[1] for x in TRANSITION_DATES_TS]:
-        max_sp = 50
-    else:
-        max_sp = 48
-    return max_sp
+def _ts2sp_core_py(timestamp_):
+    # SPs are closed on the right, so shift back by one second: 00:00:00+00:00 then falls in the
+    # last SP of the previous day rather than needing a separate SP 0 correction
+    offset = timestamp_ - 1
+    days = offset // _SEC_PER_DAY
+    sp_ = (offset % _SEC_PER_DAY) // _SEC_PER_SP + 1
+    if _BST_DAYS[days - _DAYS_OFFSET]:
+        # Add an hour for BST
+        sp_ += 2
+    # If our SP exceeds the max SP for the date, add 1 day and reset SP to 1 or 2
+    max_sp = _MAX_SP_DAYS[days - _DAYS_OFFSET]
+    if sp_ > max_sp:
+        days += 1
+        sp_ -= max_sp
+    return days, sp_
 
 
-def _validate_sp(name, sp_, date_):
-    if not isinstance(sp_, int):
+if _sp2ts is not None:
+    # Share the per-day tables with the C extension so both backends use the same transition data
+    _sp2ts.set_tables(_DAYS_OFFSET, _BST_DAYS, _MAX_SP_DAYS)
+    _sp2ts_core, _ts2sp_core = _sp2ts.sp2ts_core, _sp2ts.ts2sp_core
+else:
+    _sp2ts_core, _ts2sp_core = _sp2ts_core_py, _ts2sp_core_py
+
+
+def _in_bst_batch(days):
+    return _BST_BY_DAY[days - _DAYS_OFFSET]
+
+
+def _max_sp_batch(days):
+    return _MAX_SP_BY_DAY[days - _DAYS_OFFSET]
+
+
+def _validate_sp(name, sp_, date_, days):
+    if type(sp_) is not int:
         raise TypeError(f"`{name}` must be of type int")
-    max_sp = _max_sp(date_)
+    max_sp = _max_sp_core(days)
     if not 1 <= sp_ <= max_sp:
         raise ValueError(f"`{name}` must be in the interval 1 <= {name} <= {max_sp} on date "
                          f"{date_.isoformat()}, got {sp_}")
 
 
+def _parse_date(date_str):
+    # Check the input has exactly the documented <yyyy-mm-dd> shape before handing it to the
+    # C-level fromisoformat (which alone would also accept other ISO 8601 forms), and leave
+    # anything else to strptime, which also provides the error for malformed input
+    digits = date_str[:4] + date_str[5:7] + date_str[8:]
+    if len(date_str) == 10 and date_str[4::3] == "--" and digits.isascii() and digits.isdigit():
+        return date.fromisoformat(date_str)
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def _parse_datetime(dt_str):
+    # As _parse_date(), for the documented <yyyy-mm-ddTHH:MM:SS> format (always timezone-naive)
+    digits = dt_str[:4] + dt_str[5:7] + dt_str[8:10] + dt_str[11:13] + dt_str[14:16] + dt_str[17:]
+    if len(dt_str) == 19 and dt_str[4::3] == "--T::" and digits.isascii() and digits.isdigit():
+        return datetime.fromisoformat(dt_str)
+    return datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
+
+
 def parse_options():
     """Parse command line options."""
     parser = argparse.ArgumentParser(description=("This is a command line interface (CLI) for "
@@ -344,19 +482,21 @@ def parse_options():
     options = parser.parse_args()
     if options.date_:
         try:
-            options.date_ = datetime.strptime(options.date_, "%Y-%m-%d").date()
-        except Exception as err:
+            options.date_ = _parse_date(options.date_)
+        except ValueError as err:
             raise Exception("Failed to parse date, make sure you use <yyyy-mm-dd> format.") from err
     if options.dt:
         try:
             options.dt = options.dt.replace(" ", "T")
-            options.dt = datetime.strptime(options.dt, "%Y-%m-%dT%H:%M:%S")
-        except Exception as err:
+            options.dt = _parse_datetime(options.dt)
+        except ValueError as err:
             raise Exception("Failed to parse dt, make sure you use <yyyy-mm-ddTHH:MM:SS> format.") \
                   from err
-    if options.tz:
-        if options.tz not in pytz.all_timezones:
-            supported_timezones = ", ".join([f"'{tz}'" for tz in pytz.all_timezones])
+    if options.tz and options.tz != "UTC":
+        # The default of "UTC" is always valid, so only import pytz to look up other zones
+        import pytz
+        if options.tz not in pytz.all_timezones_set:
+            supported_timezones = ", ".join(f"'{tz}'" for tz in pytz.all_timezones)
             print(f"The specified timezone (-tz/--timezone) '{options.tz}' was not recognised. "
                   f"Here's a full list of supported time zones: \n{supported_timezones}")
     return options